@@ -1,19 +1,12 @@
 import streamlit as st
-import pandas as pd
-from config import PROJECT_DATA_DIR, PROJECT_FILES, TODAY
-from data_utils import load_data, generate_task_alerts, get_project_summary
-from visualizations import (
-    create_progress_bar, create_status_pie_chart, create_overdue_bar_chart,
-    create_task_histogram, create_task_timeline
- )
-import os
+from config import PROJECT_FILES, TODAY
+from startup import timed_import, get_import_timings, record_first_script_run, load_css, load_logo
 
 # Set page configuration
 st.set_page_config(page_title="BPL Dashboard", layout="wide")
 
-# Load custom CSS
-with open("styles/styles.css") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+# Load custom CSS (read from disk once per process)
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
 
 def landing_page():
     """Render the landing page with project selection tiles."""
@@ -30,7 +23,10 @@ def landing_page():
 
 def overview_page():
     """Render the project overview page with summary statistics and charts."""
-    st.image("assets/bpl_logo.png", width=50)
+    # Data and chart modules (pandas, plotly) are only loaded once a chart page renders
+    data_utils = timed_import("data_utils")
+    viz = timed_import("visualizations")
+    st.image(load_logo(), width=50)
     st.markdown("<h1 style='margin-top: -10px;'>Overall Project Status</h1>", unsafe_allow_html=True)
     
     if st.button("⬅ Back to Dashboard", key="back_to_dashboard"):
@@ -44,7 +40,7 @@ def overview_page():
         return
 
     project_name = [name for name, path in PROJECT_FILES.items() if path == st.session_state.selected_file][0]
-    summary_df = get_project_summary(st.session_state.selected_file, project_name)
+    summary_df = data_utils.get_project_summary(st.session_state.selected_file, project_name)
     
     if st.session_state.debug_mode:
         st.write("Debug: summary_df =", summary_df.to_dict())
@@ -61,28 +57,33 @@ def overview_page():
     st.subheader("📈 Project Progress")
     if 'Progress' in summary_df.columns:
         summary_df['Progress'] = summary_df['Progress'].astype(int)
-    progress_fig, _ = create_progress_bar(summary_df, project_name)  # Unpack tuple, use only fig
+    progress_fig, _ = viz.create_progress_bar(summary_df, project_name)  # Unpack tuple, use only fig
     if st.session_state.debug_mode:
         st.write("Debug: Project progress figure data =", progress_fig.data)
     st.plotly_chart(progress_fig, use_container_width=True, key="overview_progress_chart")
 
     st.subheader("🧩 Status Distribution")
-    st.plotly_chart(create_status_pie_chart(summary_df, project_name), use_container_width=True, key="overview_status_chart")
+    st.plotly_chart(viz.create_status_pie_chart(summary_df, project_name), use_container_width=True, key="overview_status_chart")
 
     st.subheader("🚨 Overdue Tasks")
-    st.plotly_chart(create_overdue_bar_chart(summary_df, project_name), use_container_width=True, key="overview_overdue_chart")
+    st.plotly_chart(viz.create_overdue_bar_chart(summary_df, project_name), use_container_width=True, key="overview_overdue_chart")
 
     st.markdown('<div class="signature">Code by Kuldip</div>', unsafe_allow_html=True)
 
 def dashboard_page():
     """Render the main dashboard page with task details and visualizations."""
-    st.image("assets/bpl_logo.png", width=50)
+    pd = timed_import("pandas")
+    data_utils = timed_import("data_utils")
+    viz = timed_import("visualizations")
+    st.image(load_logo(), width=50)
     st.markdown("<h1 style='margin-top: -10px;'>Task Tracker Dashboard</h1>", unsafe_allow_html=True)
     
     # Debug mode toggle
     if 'debug_mode' not in st.session_state:
         st.session_state.debug_mode = False
     st.session_state.debug_mode = st.checkbox("Enable Debug Mode", value=st.session_state.debug_mode, key="debug_mode_toggle")
+    if st.session_state.debug_mode:
+        st.write("Debug: Import timings (ms) =", get_import_timings())
 
     col1, col2 = st.columns([1, 1])
     with col1:
@@ -100,7 +101,8 @@ def dashboard_page():
         st.info("No project file selected. Please return to the project selection page.")
         return
 
-    df = load_data(st.session_state.selected_file)
+    data_version = data_utils.get_data_version(st.session_state.selected_file)
+    df = data_utils.load_data(st.session_state.selected_file, data_version)
     if df is None:
         st.error("Failed to load project data. Please check the file format and columns .")
         return
@@ -108,22 +110,14 @@ def dashboard_page():
     st.subheader("🔍 Filter by Assignee")
     assignees = df['Assignees'].unique().tolist()
     selected_assignee = st.selectbox("Facet: Select Assignee", ["All"] + assignees, key="assignee_select")
-    filtered_df = df if selected_assignee == "All" else df[df['Assignees'].str.contains(selected_assignee, case=False)]
+    filtered_df = data_utils.filter_by_assignee(df, selected_assignee)
     
     st.subheader("🚨 Task Alerts")
-    alerts = generate_task_alerts(filtered_df, TODAY)
-    if alerts and isinstance(alerts, list) and all(isinstance(a, dict) for a in alerts):
-        try:
-            alert_df = pd.DataFrame(alerts)
-            def style_alerts(row):
-                if row['Alert Type'] == 'critical':
-                    return ['color: red; font-weight: bold; animation: blink 1s infinite'] * len(row)
-                elif row['Alert Type'] == 'warning':
-                    return ['color: orange; font-weight: bold'] * len(row)
-                return [''] * len(row)
-            st.markdown(alert_df.style.apply(style_alerts, axis=1).to_html(escape=False), unsafe_allow_html=True)
-        except Exception as e:
-            st.error(f"Error creating alert DataFrame: {str(e)}")
+    alerts_html = data_utils.render_alerts_html(
+        st.session_state.selected_file, data_version, selected_assignee, TODAY
+    )
+    if alerts_html:
+        st.markdown(alerts_html, unsafe_allow_html=True)
     else:
         st.info("No alerts at this time.")
     
@@ -162,7 +156,7 @@ def dashboard_page():
     # Ensure Progress column is integer
         if 'Progress' in filtered_df.columns:
             filtered_df['Progress'] = filtered_df['Progress'].astype(int)
-        progress_fig, remaining_days_text = create_progress_bar(filtered_df, selected_task=selected_task, today=TODAY)
+        progress_fig, remaining_days_text = viz.create_progress_bar(filtered_df, selected_task=selected_task, today=TODAY)
         if st.session_state.debug_mode:
             st.write("Debug: Progress Figure Data =", progress_fig.data)
         if progress_fig.data:
@@ -181,14 +175,17 @@ def dashboard_page():
             "Per-Task Progress (One Bin per Task)"
         ]
         selected_hist_type = st.selectbox("Choose Histogram Style", hist_types, index=4, key="hist_select")
-        hist_fig = create_task_histogram(filtered_df, selected_hist_type)
+        hist_data = data_utils.get_histogram_data(
+            st.session_state.selected_file, data_version, selected_assignee
+        )
+        hist_fig = viz.create_task_histogram(hist_data, selected_hist_type)
         st.plotly_chart(hist_fig, use_container_width=True, key=f"histogram_chart_{selected_hist_type}")
 
     # Timeline section
     st.subheader("🕒 Task Timeline")
     if st.session_state.debug_mode:
         st.write("Debug: Timeline Selected Task =", selected_task)
-    timeline_fig, current_status = create_task_timeline(filtered_df, selected_task, TODAY)
+    timeline_fig, current_status = viz.create_task_timeline(filtered_df, selected_task, TODAY)
     if st.session_state.debug_mode:
         st.write("Debug: Timeline Figure Data =", timeline_fig.data)
     col_overdue, col_button = st.columns([3, 1])
@@ -224,8 +221,32 @@ def dashboard_page():
         else:
             st.warning(f"No data found for Task No: {st.session_state.show_remarks}")
 
+    st.subheader("🔮 Schedule Forecast")
+    task_forecast, forecast_summary = data_utils.get_schedule_forecast(
+        st.session_state.selected_file, data_version, selected_assignee, TODAY
+    )
+    if st.session_state.debug_mode:
+        st.write("Debug: Forecast summary =", {k: v for k, v in forecast_summary.items() if k != 'simulated_dates'})
+    if forecast_summary['tasks']:
+        st.write(f"**Forecast Completion (P50):** {forecast_summary['p50']}")
+        st.write(f"**Forecast Completion (P90):** {forecast_summary['p90']}")
+        st.write(f"**Planned End:** {forecast_summary['planned_end']}")
+        st.write(f"**Probability of Slipping Past Planned End:** {forecast_summary['slip_probability']:.0f}%")
+        if forecast_summary['on_hold']:
+            st.write(f"**On Hold (not forecast):** {forecast_summary['on_hold']}")
+        if forecast_summary['open_tasks']:
+            col_dist, col_slip = st.columns([1, 1])
+            with col_dist:
+                st.plotly_chart(viz.create_forecast_distribution_chart(forecast_summary), use_container_width=True, key="forecast_distribution_chart")
+            with col_slip:
+                st.plotly_chart(viz.create_slip_probability_chart(task_forecast), use_container_width=True, key="slip_probability_chart")
+        else:
+            st.info("No open tasks left to forecast.")
+    else:
+        st.info("Not enough dated tasks to forecast completion.")
+
     st.subheader("📊 Overall Project Status")
-    pie_fig = create_status_pie_chart(filtered_df, project_name=None)
+    pie_fig = viz.create_status_pie_chart(filtered_df, project_name=None)
     st.plotly_chart(pie_fig, use_container_width=True, key="status_pie_chart")
 
     st.subheader("Task Summary")
@@ -257,6 +278,7 @@ def main():
         overview_page()
     else:
         dashboard_page()
+    record_first_script_run()
 
 if __name__ == "__main__":
     main()
@@ -20,3 +20,18 @@ PROJECT_FILES = {
     "Project 6": os.path.join(PROJECT_DATA_DIR, "data.xlsx"),
 }
 
+
+# Alerts shown per group before the rest are collapsed
+ALERT_TOP_N = 50
+# Alerts rendered per group at most; the rest are only counted
+ALERT_MAX_ROWS = 500
+
+# Schedule forecast: Monte Carlo runs and spread (lognormal sigma) of task progress rates
+FORECAST_SIMULATIONS = 1000
+FORECAST_RATE_SIGMA = 0.3
+
+# Histogram charts bucket consecutive tasks above this many tasks
+HISTOGRAM_MAX_TASKS = 200
+
+# Entries kept per cached data function; older data versions are evicted
+CACHE_MAX_ENTRIES = 32
@@ -1,21 +1,20 @@
+import numpy as np
 import pandas as pd
 import streamlit as st
 from concurrent.futures import ThreadPoolExecutor
-import threading
 import os
-from config import TODAY
+from config import TODAY, ALERT_TOP_N, ALERT_MAX_ROWS, FORECAST_SIMULATIONS, FORECAST_RATE_SIGMA, HISTOGRAM_MAX_TASKS, CACHE_MAX_ENTRIES
 
-# Thread-safe cache for loaded data
-_data_cache = {}
-_cache_lock = threading.Lock()
-
-@st.cache_data
-def load_data(file_path):
-    """Load and process CSV or Excel data with caching."""
-    with _cache_lock:
-        if file_path in _data_cache:
-            return _data_cache[file_path]
+def get_data_version(file_path):
+    """Return a version stamp for a project file, used to key cached results."""
+    try:
+        return os.path.getmtime(file_path)
+    except OSError:
+        return None
 
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES)
+def load_data(file_path, data_version=None):
+    """Load and process CSV or Excel data with caching, keyed on the file's data version."""
     try:
         if not os.path.exists(file_path):
             st.error(f"File not found: {file_path}")
@@ -41,13 +40,17 @@ def load_data(file_path):
             st.error(f"Invalid or missing data in 'Task No', 'Task', or 'Status' columns in {file_path}")
             return None
 
-        with _cache_lock:
-            _data_cache[file_path] = df
         return df
     except Exception as e:
         st.error(f"Error loading file {file_path}: {str(e)}")
         return None
 
+def filter_by_assignee(df, assignee):
+    """Return the tasks assigned to assignee, or all tasks for "All"."""
+    if assignee == "All":
+        return df
+    return df[df['Assignees'].str.contains(assignee, case=False, regex=False, na=False)]
+
 def generate_task_alerts(df, today):
     """Generate task alerts based on progress and deadlines."""
     alerts = []
@@ -105,9 +108,284 @@ def generate_task_alerts(df, today):
             })
     return alerts
 
+# Upper bound on simulated values held in memory at once (float32 elements)
+FORECAST_CHUNK_ELEMENTS = 4_000_000
+# Forecasts further out than this are capped (keeps dates within pandas' range)
+FORECAST_MAX_DAYS = 36500
+# Standard normal quantile for the 90th percentile
+_Z90 = 1.2815515655446004
+
+def _days_to_dates(today, days):
+    """Convert day offsets from today into dates, rounding up to whole days."""
+    days = np.minimum(np.ceil(days), FORECAST_MAX_DAYS)
+    return pd.to_datetime(today) + pd.to_timedelta(days, unit='D')
+
+def forecast_task_completion(df, today, n_simulations=FORECAST_SIMULATIONS, rate_sigma=FORECAST_RATE_SIGMA, seed=0):
+    """Forecast task and project completion dates with a vectorized Monte Carlo simulation.
+
+    Each task's progress rate is Progress over the days elapsed since its start
+    date (planned rate 100 / duration for tasks not yet started or at 0%), and
+    is scaled by a lognormal factor per simulation. Completed tasks (Status
+    "Completed" or 100% progress) and tasks on Hold, which have no rate to
+    extrapolate, are not simulated and get no forecast dates. Returns a
+    per-task DataFrame and a project-level summary dict.
+    """
+    columns = ['Task No', 'Task', 'End date', 'Forecast P50', 'Forecast P90', 'Slip Probability (%)']
+    summary = {'tasks': 0, 'open_tasks': 0, 'on_hold': 0, 'simulations': n_simulations, 'p50': None, 'p90': None,
+               'planned_end': None, 'slip_probability': None, 'simulated_dates': pd.DatetimeIndex([])}
+    if df.empty:
+        return pd.DataFrame(columns=columns), summary
+
+    today64 = np.datetime64(today, 'D')
+    start = df['Start date'].values.astype('datetime64[D]')
+    end = df['End date'].values.astype('datetime64[D]')
+    progress = np.clip(df['Progress'].to_numpy(dtype=float), 0, 100)
+    status = df['Status'].astype(str).str.strip().str.lower().to_numpy()
+
+    valid = ~np.isnat(start) & ~np.isnat(end) & (end > start)
+    duration = np.where(valid, (end - start).astype(float), np.nan)
+    elapsed = (today64 - start).astype(float)
+    start_offset = np.where(valid, np.maximum(-elapsed, 0), np.nan)
+    end_offset = np.where(valid, (end - today64).astype(float), np.nan)
+
+    observed = valid & (elapsed > 0) & (progress > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = np.where(observed, progress / elapsed, 100 / duration)
+        base_days = np.where(valid, (100 - progress) / rate, np.nan)
+    done = valid & ((progress >= 100) | (status == 'completed'))
+    on_hold = valid & ~done & np.isin(status, ['hold', 'on hold'])
+    is_open = valid & ~done & ~on_hold
+
+    # Simulate only the tasks that can still finish late
+    open_idx = np.flatnonzero(is_open)
+    base = base_days[open_idx].astype(np.float32)
+    offset = start_offset[open_idx].astype(np.float32)
+    deadline = end_offset[open_idx].astype(np.float32)
+
+    rng = np.random.default_rng(seed)
+    slip_counts = np.zeros(len(open_idx), dtype=np.int64)
+    project_days = np.zeros(n_simulations, dtype=np.float32)
+    if len(open_idx):
+        chunk = max(1, FORECAST_CHUNK_ELEMENTS // len(open_idx))
+        for lo in range(0, n_simulations, chunk):
+            hi = min(lo + chunk, n_simulations)
+            finish = rng.standard_normal((hi - lo, len(open_idx)), dtype=np.float32)
+            finish *= rate_sigma
+            np.exp(finish, out=finish)
+            finish *= base
+            finish += offset
+            slip_counts += (finish > deadline).sum(axis=0)
+            project_days[lo:hi] = finish.max(axis=1)
+
+    # Per-task quantiles follow in closed form from the same lognormal model
+    task_p50 = np.where(is_open, start_offset + base_days, np.nan)
+    task_p90 = np.where(is_open, start_offset + base_days * np.exp(_Z90 * rate_sigma), np.nan)
+    slip = np.where(done, 0.0, np.nan)
+    slip[open_idx] = slip_counts / n_simulations * 100
+
+    task_forecast = pd.DataFrame({
+        'Task No': df['Task No'].to_numpy(),
+        'Task': df['Task'].to_numpy(),
+        'End date': df['End date'].to_numpy(),
+        'Forecast P50': _days_to_dates(today, task_p50),
+        'Forecast P90': _days_to_dates(today, task_p90),
+        'Slip Probability (%)': slip,
+    })
+
+    if valid.any():
+        planned_days = float(np.nanmax(end_offset))
+        summary.update(
+            tasks=int(valid.sum()),
+            open_tasks=len(open_idx),
+            on_hold=int(on_hold.sum()),
+            planned_end=_days_to_dates(today, planned_days).date(),
+        )
+        if len(open_idx):
+            p50, p90 = np.percentile(project_days, [50, 90])
+            summary.update(
+                p50=_days_to_dates(today, p50).date(),
+                p90=_days_to_dates(today, p90).date(),
+                slip_probability=float((project_days > planned_days).mean() * 100),
+                simulated_dates=_days_to_dates(today, project_days),
+            )
+        else:
+            # Nothing left to simulate: the project ends with its latest planned end
+            summary.update(p50=summary['planned_end'], p90=summary['planned_end'], slip_probability=0.0)
+    return task_forecast, summary
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def get_schedule_forecast(file_path, data_version, assignee, today, n_simulations=FORECAST_SIMULATIONS):
+    """Forecast completion for a project, cached per (data version, assignee, date)."""
+    df = load_data(file_path, data_version)
+    if df is None:
+        return forecast_task_completion(pd.DataFrame(), today, n_simulations)
+    df = filter_by_assignee(df, assignee)
+    return forecast_task_completion(df, today, n_simulations)
+
+ALERT_COLUMNS = ['Task No', 'Task', 'Progress (%)', 'Alert']
+ALERT_SEVERITY = {'critical': 0, 'warning': 1, 'normal': 2}
+
+def _escape_html(series):
+    """Escape HTML special characters in a Series of values."""
+    return (series.astype(str)
+            .str.replace('&', '&amp;', regex=False)
+            .str.replace('<', '&lt;', regex=False)
+            .str.replace('>', '&gt;', regex=False)
+            .str.replace('"', '&quot;', regex=False))
+
+def _alert_table(rows):
+    """Wrap pre-rendered alert rows in a table with a header."""
+    header = "".join(f"<th>{col}</th>" for col in ALERT_COLUMNS)
+    return f"<table class='alert-table'><thead><tr>{header}</tr></thead><tbody>{''.join(rows)}</tbody></table>"
+
+def _alert_block(rows, top_n, total):
+    """Render the first top_n rows as a table, collapse the rest, and count rows past the cap."""
+    if top_n is None or len(rows) <= top_n:
+        html = _alert_table(rows)
+    else:
+        hidden = rows[top_n:]
+        html = (_alert_table(rows[:top_n]) +
+                f"<details class='alert-more'><summary>Show {len(hidden)} more</summary>{_alert_table(hidden)}</details>")
+    if total > len(rows):
+        html += f"<p class='alert-omitted'>{total - len(rows)} more alerts not shown</p>"
+    return html
+
+def build_alerts_html(alerts, group_by_type=True, top_n=ALERT_TOP_N, max_rows=ALERT_MAX_ROWS):
+    """Render alert dicts as class-based HTML, optionally grouped by type.
+
+    Each block shows top_n rows, collapses the rest up to max_rows, and only
+    counts alerts past max_rows so the markup size stays bounded.
+    """
+    if not alerts:
+        return ""
+    alert_df = pd.DataFrame(alerts)
+    alert_df['Severity'] = alert_df['Alert Type'].map(ALERT_SEVERITY).fillna(len(ALERT_SEVERITY))
+    alert_df = alert_df.sort_values(['Severity', 'Task No'], kind='stable')
+    block = alert_df['Alert Type'] if group_by_type else pd.Series('all', index=alert_df.index)
+    totals = block.value_counts(sort=False)
+    if max_rows is not None:
+        alert_df = alert_df.groupby(block, sort=False).head(max_rows)
+        block = block.loc[alert_df.index]
+
+    task_no = alert_df['Task No']
+    if pd.api.types.is_numeric_dtype(task_no) and (task_no % 1 == 0).all():
+        task_no = task_no.astype('int64')
+    cells = [task_no, alert_df['Task'], alert_df['Progress (%)'], alert_df['Alert']]
+    rows = "<tr class='alert-" + _escape_html(alert_df['Alert Type']) + "'>"
+    for cell in cells:
+        rows = rows + "<td>" + _escape_html(cell) + "</td>"
+    rows = rows + "</tr>"
+
+    if not group_by_type:
+        return _alert_block(rows.tolist(), top_n, totals['all'])
+
+    html = []
+    for alert_type, group in rows.groupby(block, sort=False):
+        html.append(
+            f"<details class='alert-group alert-group-{alert_type}' open>"
+            f"<summary>{str(alert_type).title()} ({totals[alert_type]})</summary>"
+            f"{_alert_block(group.tolist(), top_n, totals[alert_type])}</details>"
+        )
+    return "".join(html)
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def render_alerts_html(file_path, data_version, assignee, today, group_by_type=True, top_n=ALERT_TOP_N,
+                       max_rows=ALERT_MAX_ROWS):
+    """Build the alerts markup for a project, cached per (data version, assignee, date)."""
+    df = load_data(file_path, data_version)
+    if df is None:
+        return ""
+    df = filter_by_assignee(df, assignee)
+    return build_alerts_html(generate_task_alerts(df, today), group_by_type, top_n, max_rows)
+
+# Bar colors by progress: 100%, >=75%, >=50%, >=25%, below 25%
+PROGRESS_COLORS = ["#187896", "#51C951", "#C5C560", "#B88323", "#FF0000"]
+
+def progress_colors(progress):
+    """Map an array of progress values to bar colors."""
+    progress = np.asarray(progress, dtype=float)
+    return np.select(
+        [progress == 100, progress >= 75, progress >= 50, progress >= 25],
+        PROGRESS_COLORS[:4],
+        default=PROGRESS_COLORS[4]
+    )
+
+def _assignee_groups(tasks):
+    """Group tasks per assignee with the same matching as the assignee filter.
+
+    A task shared by several assignees appears in each of their groups, so
+    every group equals what selecting that assignee in the filter shows.
+    """
+    return {assignee: filter_by_assignee(tasks, assignee)
+            for assignee in tasks['Assignees'].dropna().unique()}
+
+def build_histogram_data(df, max_tasks=HISTOGRAM_MAX_TASKS):
+    """Precompute plot data for every histogram style in one pass over the tasks.
+
+    Above max_tasks tasks, consecutive tasks (by Task No) are grouped into
+    max_tasks buckets so the per-task styles stay a bounded size.
+    """
+    data = {'count': len(df), 'aggregated': False}
+    if df.empty:
+        return data
+    tasks = df[['Task No', 'Task', 'Status', 'Progress', 'Assignees']].sort_values('Task No', kind='stable')
+    # Integer progress, as shown by the progress bar and the rest of the dashboard
+    tasks = tasks.assign(Progress=tasks['Progress'].astype(int))
+    progress = tasks['Progress'].to_numpy()
+
+    # Ten 10% bins plus a bin of its own for completed (100%) work
+    counts, edges = np.histogram(progress, bins=np.arange(0, 111, 10))
+    total = counts.sum()
+    data['bins'] = {'left': edges[:-1], 'width': np.diff(edges),
+                    'percent': counts / total * 100 if total else counts.astype(float)}
+
+    if len(tasks) > max_tasks:
+        data['aggregated'] = True
+        bucket = np.arange(len(tasks)) * max_tasks // len(tasks)
+        grouped = tasks.assign(Bucket=bucket).groupby('Bucket', sort=True)
+        first, last, size = grouped['Task No'].first(), grouped['Task No'].last(), grouped.size()
+        labels = [f"{a:.15g}-{b:.15g}" for a, b in zip(first, last)]
+        mean_progress = grouped['Progress'].mean().round(1).to_numpy()
+        data['tasks'] = {
+            'x': labels,
+            'progress': mean_progress,
+            'hover': [f"{n} tasks" for n in size],
+            'colors': progress_colors(mean_progress),
+        }
+        status_counts = pd.crosstab(tasks['Status'], pd.Categorical(bucket, categories=range(len(labels))))
+        data['status'] = {status: {'x': labels, 'y': row.to_numpy()} for status, row in status_counts.iterrows()}
+        groups = _assignee_groups(tasks)
+        data['assignees'] = {
+            'x': list(groups),
+            'progress': np.array([group['Progress'].mean() for group in groups.values()]).round(1),
+            'tasks': np.array([len(group) for group in groups.values()]),
+        }
+        return data
+
+    data['tasks'] = {
+        'x': tasks['Task No'].to_numpy(),
+        'progress': progress,
+        'hover': tasks['Task'].astype(str).to_numpy(),
+        'colors': progress_colors(progress),
+    }
+    data['status'] = {status: {'x': group['Task No'].to_numpy(), 'y': np.ones(len(group), dtype=int)}
+                      for status, group in tasks.groupby('Status', sort=False)}
+    data['assignees'] = {assignee: {'x': group['Task No'].to_numpy(), 'progress': group['Progress'].to_numpy()}
+                         for assignee, group in _assignee_groups(tasks).items()}
+    return data
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_MAX_ENTRIES)
+def get_histogram_data(file_path, data_version, assignee, max_tasks=HISTOGRAM_MAX_TASKS):
+    """Build histogram plot data for a project, cached per (data version, assignee)."""
+    df = load_data(file_path, data_version)
+    if df is None:
+        return build_histogram_data(pd.DataFrame(), max_tasks)
+    df = filter_by_assignee(df, assignee)
+    return build_histogram_data(df, max_tasks)
+
 def get_project_summary(file_path, project_name):
     """Generate project summary statistics."""
-    df = load_data(file_path)
+    df = load_data(file_path, get_data_version(file_path))
     if df is None or df.empty:
         st.warning(f"No data loaded for project {project_name}. Check file path: {file_path}")
         return pd.DataFrame({
@@ -0,0 +1,355 @@
+"""Concurrent-session load test for the dashboard.
+
+Starts one `streamlit run app.py` server on an ephemeral port (the same
+single process a container runs) and drives it with N concurrent
+websocket clients, each walking the real page flow
+(landing -> dashboard -> assignee filter -> task select -> overview).
+All sessions share the server's caches, interpreter and cores. Reports
+per-rerun latency, throughput and server memory per session.
+
+    python loadtest.py --sessions 8 --iterations 3
+    python loadtest.py --sessions 20 --synthetic-tasks 2000 --json
+
+Requires the `websockets` package (installed with recent Streamlit).
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+import warnings
+
+import numpy as np
+import pandas as pd
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.Selectbox_pb2 import Selectbox
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from websockets.sync.client import connect
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(BASE_DIR, "app.py")
+# Each entry is one script rerun; navigation buttons only set session state,
+# so opening a page takes a click rerun followed by the rerun that draws it
+STEPS = ["landing", "select project", "dashboard", "assignee filter", "task select", "open overview", "overview"]
+
+# The app reads styles, assets and data with paths relative to the repo root
+os.chdir(BASE_DIR)
+sys.path.insert(0, BASE_DIR)
+
+from config import PROJECT_FILES, TODAY  # noqa: E402
+from data_utils import load_data  # noqa: E402
+
+# Runs `streamlit run` with extra (e.g. synthetic) projects registered in config first
+_SERVER_BOOTSTRAP = """
+import json, os, sys
+import config
+config.PROJECT_FILES.update(json.loads(os.environ.get("LOADTEST_EXTRA_PROJECTS", "{}")))
+from streamlit.web import cli
+sys.exit(cli.main())
+"""
+
+# Sessions are long-lived objects here, not `with` blocks
+warnings.filterwarnings("ignore", message=r"connect\(\) must be used as a context manager")
+
+# Newer Streamlit sends selectbox values as the option string, older ones as the index
+_SELECTBOX_USES_STRING = "raw_value" in Selectbox.DESCRIPTOR.fields_by_name
+
+def _rss_bytes(pid):
+    """Return the resident set size of a process, or None if unavailable."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def _free_port():
+    """Return a free TCP port on localhost."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def create_synthetic_project(num_tasks, directory, seed=0):
+    """Write a synthetic project CSV with num_tasks tasks and return its path."""
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp(TODAY) - pd.to_timedelta(rng.integers(0, 120, num_tasks), unit="D")
+    end = start + pd.to_timedelta(rng.integers(5, 180, num_tasks), unit="D")
+    progress = rng.choice([0, 10, 25, 40, 50, 60, 75, 90, 100], num_tasks)
+    status = np.where(progress == 100, "Completed", np.where(progress == 0, "Not Started", "In Progress"))
+    df = pd.DataFrame({
+        "Task No": np.arange(1, num_tasks + 1),
+        "Task": [f"Synthetic task {i}" for i in range(1, num_tasks + 1)],
+        "Status": status,
+        "Progress": progress,
+        "Start date": start.strftime("%Y-%m-%d"),
+        "End date": end.strftime("%Y-%m-%d"),
+        "Assignees": [f"Assignee{i}" for i in rng.integers(1, 11, num_tasks)],
+        "Remarks": "",
+    })
+    path = os.path.join(directory, f"synthetic_{num_tasks}.csv")
+    df.to_csv(path, index=False)
+    return path
+
+class StreamlitServer:
+    """A `streamlit run app.py` subprocess on an ephemeral port."""
+
+    def __init__(self, extra_projects=None, timeout=60):
+        self.port = _free_port()
+        env = dict(os.environ, LOADTEST_EXTRA_PROJECTS=json.dumps(extra_projects or {}))
+        self.process = subprocess.Popen(
+            [sys.executable, "-c", _SERVER_BOOTSTRAP, "run", APP_PATH,
+             "--server.port", str(self.port),
+             "--server.address", "127.0.0.1",
+             "--server.headless", "true",
+             "--server.enableXsrfProtection", "false",
+             "--server.fileWatcherType", "none",
+             "--browser.gatherUsageStats", "false"],
+            cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        self._wait_healthy(timeout)
+
+    @property
+    def url(self):
+        return f"ws://127.0.0.1:{self.port}/_stcore/stream"
+
+    def _wait_healthy(self, timeout):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Streamlit server exited with code {self.process.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=1) as resp:
+                    if resp.status == 200:
+                        return
+            except OSError:
+                time.sleep(0.2)
+        self.stop()
+        raise RuntimeError("Streamlit server did not become healthy in time")
+
+    def rss_bytes(self):
+        return _rss_bytes(self.process.pid)
+
+    def stop(self):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+class SessionClient:
+    """One browser-like websocket session: sends reruns with widget state, reads the deltas."""
+
+    def __init__(self, url, timeout):
+        self.timeout = timeout
+        self.ws = connect(url, subprotocols=["streamlit"], max_size=None, open_timeout=timeout)
+        self.widgets = {}  # user key -> (element type, element proto)
+        self.states = {}   # widget id -> WidgetState carried across reruns
+
+    def rerun(self, triggers=()):
+        """Run the script once; return its latency in seconds."""
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = ""
+        msg.rerun_script.widget_states.widgets.extend(list(self.states.values()) + list(triggers))
+        start = time.perf_counter()
+        self.ws.send(msg.SerializeToString())
+        widgets, errors = {}, []
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(self.ws.recv(timeout=self.timeout))
+            kind = fwd.WhichOneof("type")
+            if kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type == "exception":
+                    errors.append(element.exception.message)
+                elif element_type in ("button", "selectbox", "checkbox"):
+                    widget = getattr(element, element_type)
+                    # Keyed widget ids look like "$$ID-<hash>-<user key>"
+                    key = widget.id.split("-", 2)[2] if widget.id.startswith("$$ID-") else widget.id
+                    widgets[key] = (element_type, widget)
+            elif kind == "script_finished":
+                break
+        latency = time.perf_counter() - start
+        self.widgets = widgets
+        # The frontend only reports state for widgets still on the page
+        present = {widget.id for _, widget in widgets.values()}
+        self.states = {wid: state for wid, state in self.states.items() if wid in present}
+        if errors:
+            raise RuntimeError(errors[0])
+        return latency
+
+    def _widget(self, key):
+        if key not in self.widgets:
+            raise KeyError(f"widget {key!r} not on page")
+        return self.widgets[key][1]
+
+    def click(self, key):
+        return self.rerun([WidgetState(id=self._widget(key).id, trigger_value=True)])
+
+    def select(self, key, index):
+        widget = self._widget(key)
+        state = WidgetState(id=widget.id)
+        if _SELECTBOX_USES_STRING:
+            state.string_value = widget.options[index]
+        else:
+            state.int_value = index
+        self.states[widget.id] = state
+        return self.rerun()
+
+    def options(self, key):
+        return list(self._widget(key).options)
+
+    def close(self):
+        self.ws.close()
+
+def run_session_flow(client, project_name, rng, latencies):
+    """Walk one session through the page flow, appending (step, seconds) per rerun."""
+    latencies.append(("landing", client.rerun()))
+    latencies.append(("select project", client.click(f"project_button_{project_name}")))
+    latencies.append(("dashboard", client.rerun()))
+    assignees = client.options("assignee_select")
+    latencies.append(("assignee filter", client.select("assignee_select", rng.randrange(len(assignees)))))
+    tasks = client.options("task_select")
+    if len(tasks) > 1:
+        latencies.append(("task select", client.select("task_select", rng.randrange(1, len(tasks)))))
+    latencies.append(("open overview", client.click("to_overview ")))
+    latencies.append(("overview", client.rerun()))
+
+def run_load_test(server, projects, sessions, iterations, timeout=60, seed=0):
+    """Run sessions concurrently against one server, each repeating the page flow iterations times."""
+    # Warm the server (imports, per-project caches) so the measurements show steady state
+    for project_name in projects:
+        warmup = SessionClient(server.url, timeout)
+        run_session_flow(warmup, project_name, random.Random(seed), [])
+        warmup.close()
+
+    rss_before = server.rss_bytes()
+    barrier = threading.Barrier(sessions)
+    results = [None] * sessions
+
+    def worker(idx):
+        # Each iteration is a fresh browser session; the last one stays connected for the memory sample
+        rng = random.Random(seed + idx)
+        project_name = projects[idx % len(projects)]
+        latencies, errors, client = [], [], None
+        barrier.wait()
+        start = time.perf_counter()
+        for _ in range(iterations):
+            try:
+                if client is not None:
+                    client.close()
+                client = SessionClient(server.url, timeout)
+                run_session_flow(client, project_name, rng, latencies)
+            except Exception as e:
+                errors.append(f"{project_name}: {e!r}")
+        results[idx] = {"client": client, "latencies": latencies, "errors": errors,
+                        "start": start, "end": time.perf_counter()}
+
+    threads = [threading.Thread(target=worker, args=(idx,)) for idx in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Sessions stay connected while memory is sampled, so their state is still held
+    rss_after = server.rss_bytes()
+    for r in results:
+        if r["client"] is not None:
+            r["client"].close()
+
+    wall_time = max(r["end"] for r in results) - min(r["start"] for r in results)
+    latencies = [item for r in results for item in r["latencies"]]
+    errors = [err for r in results for err in r["errors"]]
+    memory_per_session = None
+    if rss_before is not None and rss_after is not None:
+        memory_per_session = (rss_after - rss_before) / sessions
+    return summarize(latencies, errors, wall_time, sessions, iterations, memory_per_session)
+
+def _percentiles(values):
+    """Return p50/p95/p99 in milliseconds."""
+    if not values:
+        return {"p50": None, "p95": None, "p99": None}
+    p50, p95, p99 = np.percentile(np.asarray(values) * 1000, [50, 95, 99])
+    return {"p50": round(p50, 1), "p95": round(p95, 1), "p99": round(p99, 1)}
+
+def summarize(latencies, errors, wall_time, sessions, iterations, memory_per_session):
+    """Aggregate raw rerun latencies into a report dict."""
+    per_step = {}
+    for step in STEPS:
+        values = [seconds for name, seconds in latencies if name == step]
+        per_step[step] = dict(count=len(values), **_percentiles(values))
+    return {
+        "sessions": sessions,
+        "iterations": iterations,
+        "reruns": len(latencies),
+        "errors": errors,
+        "wall_time_s": round(wall_time, 2),
+        "throughput_reruns_per_s": round(len(latencies) / wall_time, 2) if wall_time else None,
+        "latency_ms": _percentiles([seconds for _, seconds in latencies]),
+        "latency_ms_by_step": per_step,
+        "memory_mb_per_session": round(memory_per_session / 2 ** 20, 2) if memory_per_session is not None else None,
+    }
+
+def print_report(report):
+    """Print a human-readable summary of a load test report."""
+    print(f"Sessions: {report['sessions']}  Iterations: {report['iterations']}  "
+          f"Reruns: {report['reruns']}  Wall time: {report['wall_time_s']} s")
+    print(f"Throughput: {report['throughput_reruns_per_s']} reruns/s")
+    overall = report["latency_ms"]
+    print(f"Rerun latency (ms): p50={overall['p50']}  p95={overall['p95']}  p99={overall['p99']}")
+    for step, stats in report["latency_ms_by_step"].items():
+        print(f"  {step:<16} n={stats['count']:<5} p50={stats['p50']}  p95={stats['p95']}  p99={stats['p99']}")
+    memory = report["memory_mb_per_session"]
+    print(f"Server memory per session: {memory if memory is not None else 'n/a'} MB (RSS delta)")
+    if report["errors"]:
+        print(f"Errors ({len(report['errors'])}):")
+        for err in report["errors"][:10]:
+            print(f"  {err}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the BPL dashboard.")
+    parser.add_argument("--sessions", type=int, default=4, help="number of concurrent sessions")
+    parser.add_argument("--iterations", type=int, default=2, help="page flows per session")
+    parser.add_argument("--synthetic-tasks", type=int, default=0,
+                        help="add a synthetic project with this many tasks and run only against it")
+    parser.add_argument("--project", action="append", help="project name from config.PROJECT_FILES (repeatable)")
+    parser.add_argument("--timeout", type=float, default=60, help="per-rerun timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        extra_projects = {}
+        if args.synthetic_tasks:
+            name = f"Synthetic ({args.synthetic_tasks} tasks)"
+            extra_projects[name] = create_synthetic_project(args.synthetic_tasks, tmp_dir, args.seed)
+            PROJECT_FILES.update(extra_projects)
+            projects = [name]
+        else:
+            projects = args.project or list(PROJECT_FILES)
+        # Skip projects whose files cannot be loaded
+        projects = [name for name in projects if name in PROJECT_FILES and load_data(PROJECT_FILES[name]) is not None]
+        if not projects:
+            parser.error("no loadable projects to test")
+
+        server = StreamlitServer(extra_projects, args.timeout)
+        try:
+            report = run_load_test(server, projects, args.sessions, args.iterations, args.timeout, args.seed)
+        finally:
+            server.stop()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 1 if report["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
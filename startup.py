@@ -0,0 +1,67 @@
+import importlib
+import os
+import sys
+import time
+import streamlit as st
+
+def _process_age():
+    """Return seconds since this process started (from /proc), or None where unavailable."""
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the parenthesised command name; starttime is field 22 of stat
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+# Startup reference points, taken when the first script run imports this module.
+# Wall-clock process age at that moment includes however long the server idled
+# waiting for its first visitor, so server boot is reported as CPU time instead.
+_SERVER_BOOT_CPU_SECONDS = time.process_time()
+_FIRST_SESSION_AFTER_SECONDS = _process_age()
+_FIRST_RUN_START = time.perf_counter()
+
+# Seconds spent importing each lazily loaded module
+_import_timings = {}
+_first_run_seconds = None
+
+def timed_import(module_name):
+    """Import a module on first use and record how long the import took."""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    _import_timings[module_name] = time.perf_counter() - start
+    print(f"[startup] imported {module_name} in {_import_timings[module_name] * 1000:.1f} ms", file=sys.stderr)
+    return module
+
+def get_import_timings():
+    """Return recorded import times in milliseconds, keyed by module name."""
+    return {name: round(seconds * 1000, 1) for name, seconds in _import_timings.items()}
+
+def record_first_script_run():
+    """Log server boot and first script run timings once per process."""
+    global _first_run_seconds
+    if _first_run_seconds is None:
+        _first_run_seconds = time.perf_counter() - _FIRST_RUN_START
+        print(f"[startup] server boot: {_SERVER_BOOT_CPU_SECONDS * 1000:.1f} ms CPU", file=sys.stderr)
+        if _FIRST_SESSION_AFTER_SECONDS is not None:
+            print(f"[startup] first session arrived {_FIRST_SESSION_AFTER_SECONDS * 1000:.1f} ms after process start "
+                  "(includes idle time)", file=sys.stderr)
+        print(f"[startup] first script run: {_first_run_seconds * 1000:.1f} ms", file=sys.stderr)
+    return _first_run_seconds
+
+@st.cache_resource
+def load_css(path="styles/styles.css"):
+    """Read the stylesheet once per process."""
+    with open(path) as f:
+        return f.read()
+
+@st.cache_resource
+def load_logo(path="assets/bpl_logo.png"):
+    """Read the logo image once per process."""
+    with open(path, "rb") as f:
+        return f.read()
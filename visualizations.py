@@ -1,8 +1,7 @@
-import plotly.express as px
+import numpy as np
 import plotly.graph_objects as go
 import pandas as pd
 import streamlit as st
-import plotly.graph_objs as go
 
 def create_progress_bar(df, project_name=None, selected_task=None, today=None):
     """Create a progress bar for project or task."""
@@ -182,42 +181,56 @@ def create_overdue_bar_chart(df, project_name):
     )
     return fig
 
-def create_task_histogram(df, hist_type):
-    """Create a histogram based on the selected style."""
-    if df.empty:
+def create_task_histogram(hist_data, hist_type):
+    """Create a histogram based on the selected style from precomputed histogram data."""
+    if not hist_data['count']:
         st.warning("No data available for histogram.")
         return go.Figure()
+    aggregated = hist_data['aggregated']
+    task_axis = "Task Number (grouped)" if aggregated else "Task Number"
+    tasks = hist_data['tasks']
     if hist_type == "Simple Bar (Progress by Task)":
         fig = go.Figure()
         fig.add_trace(go.Bar(
-            x=df['Task No'],
-            y=df['Progress'],
-            text=df['Progress'],
+            x=tasks['x'],
+            y=tasks['progress'],
+            text=tasks['progress'],
             textposition='auto',
             marker_color='skyblue',
             name='Progress'
         ))
         fig.update_layout(
-            title="Progress by Task Number",
-            xaxis_title="Task Number",
+            title="Average Progress by Task Group" if aggregated else "Progress by Task Number",
+            xaxis_title=task_axis,
             yaxis_title="Progress (%)",
             bargap=0.2,
             yaxis_range=[0, 100]
         )
     elif hist_type == "Grouped Bar (Progress by Assignee)":
         fig = go.Figure()
-        for assignee in df['Assignees'].unique():
-            assignee_df = df[df['Assignees'].str.contains(assignee, case=False)]
+        assignees = hist_data['assignees']
+        if aggregated:
             fig.add_trace(go.Bar(
-                x=assignee_df['Task No'],
-                y=assignee_df['Progress'],
-                name=assignee,
-                text=assignee_df['Progress'],
-                textposition='auto'
+                x=assignees['x'],
+                y=assignees['progress'],
+                text=assignees['progress'],
+                textposition='auto',
+                customdata=assignees['tasks'],
+                hovertemplate='Assignee: %{x}<br>Average Progress: %{y}%<br>Tasks: %{customdata}',
+                name='Average Progress'
             ))
+        else:
+            for assignee, values in assignees.items():
+                fig.add_trace(go.Bar(
+                    x=values['x'],
+                    y=values['progress'],
+                    name=assignee,
+                    text=values['progress'],
+                    textposition='auto'
+                ))
         fig.update_layout(
-            title="Progress by Task and Assignee",
-            xaxis_title="Task Number",
+            title="Average Progress by Assignee" if aggregated else "Progress by Task and Assignee",
+            xaxis_title="Assignee" if aggregated else "Task Number",
             yaxis_title="Progress (%)",
             bargap=0.2,
             barmode='group',
@@ -225,71 +238,60 @@ def create_task_histogram(df, hist_type):
         )
     elif hist_type == "Stacked Bar (Count by Status)":
         fig = go.Figure()
-        for status in df['Status'].unique():
-            status_df = df[df['Status'] == status]
+        for status, values in hist_data['status'].items():
             fig.add_trace(go.Bar(
-                x=status_df['Task No'],
-                y=[1] * len(status_df),
+                x=values['x'],
+                y=values['y'],
                 name=status,
                 text=status,
                 textposition='none'
             ))
         fig.update_layout(
             title="Task Count by Status and Task Number",
-            xaxis_title="Task Number",
+            xaxis_title=task_axis,
             yaxis_title="Number of Tasks",
             bargap=0.2,
             barmode='stack'
         )
     elif hist_type == "Progress Distribution (Binned)":
-        fig = px.histogram(
-            df,
-            x='Progress',
-            nbins=10,
-            title="Distribution of Progress Values",
-            labels={'Progress': 'Progress (%)'},
-            histnorm='percent',
-            color_discrete_sequence=['lightgreen']
-        )
+        bins = hist_data['bins']
+        fig = go.Figure()
+        fig.add_trace(go.Bar(
+            x=bins['left'] + bins['width'] / 2,
+            y=bins['percent'],
+            width=bins['width'],
+            marker_color='lightgreen',
+            name='Progress'
+        ))
         fig.update_layout(
+            title="Distribution of Progress Values",
             xaxis_title="Progress (%)",
             yaxis_title="Percentage of Tasks",
             bargap=0.2
         )
     else:  # Per-Task Progress (One Bin per Task)
-        def get_color(progress):
-            if progress == 100:
-                return "#187896"
-            elif progress >= 75:
-                return "#51C951"
-            elif progress >= 50:
-                return "#C5C560"
-            elif progress >= 25:
-                return "#B88323"
-            else:
-                return '#FF0000'
-        
-        colors = df['Progress'].apply(get_color).tolist()
         fig = go.Figure()
         fig.add_trace(go.Bar(
-            x=df['Task No'],
-            y=df['Progress'],
-            text=df['Progress'],
+            x=tasks['x'],
+            y=tasks['progress'],
+            text=tasks['progress'],
             textposition='auto',
-            marker_color=colors,
+            marker_color=tasks['colors'],
             name='Progress',
             hovertemplate='Task: %{customdata}<br>Progress: %{y}%',
-            customdata=df['Task']
+            customdata=tasks['hover']
         ))
         fig.update_layout(
             title="Progress Percentage per Task",
-            xaxis_title="Task Number",
+            xaxis_title=task_axis,
             yaxis_title="Progress (%)",
             yaxis_range=[0, 100],
             bargap=0.2,
-            xaxis=dict(tickmode='linear', dtick=1),
+            xaxis=dict(type='category') if aggregated else dict(tickmode='linear', dtick=1),
             showlegend=False
         )
+    if aggregated and hist_type != "Progress Distribution (Binned)":
+        fig.update_xaxes(type='category')  # bucket labels such as "1-25" must not be parsed as dates
     return fig
 
 def create_task_timeline(df, selected_task, today):
@@ -350,4 +352,67 @@ def create_task_timeline(df, selected_task, today):
         yaxis_range=[0, 100],
         showlegend=False
     )
-    return fig, current_status
\ No newline at end of file
+    return fig, current_status
+
+def create_forecast_distribution_chart(forecast_summary):
+    """Create a histogram of simulated project completion dates with P50/P90 markers."""
+    finish_dates = forecast_summary['simulated_dates']
+    if len(finish_dates) == 0:
+        st.warning("No data available for schedule forecast.")
+        return go.Figure()
+    fig = go.Figure()
+    fig.add_trace(go.Histogram(
+        x=finish_dates,
+        marker_color='skyblue',
+        name='Simulated Completion'
+    ))
+    for label, value, color in [('P50', forecast_summary['p50'], 'orange'),
+                                ('P90', forecast_summary['p90'], 'red'),
+                                ('Planned', forecast_summary['planned_end'], 'lightgreen')]:
+        if value is not None:
+            fig.add_vline(x=pd.Timestamp(value).timestamp() * 1000, line_dash='dash', line_color=color,
+                          annotation_text=label, annotation_position='top')
+    fig.update_layout(
+        title=f"Project Completion Forecast ({forecast_summary['simulations']} simulations)",
+        xaxis_title="Completion Date",
+        yaxis_title="Number of Simulations",
+        bargap=0.05,
+        showlegend=False
+    )
+    return fig
+
+def create_slip_probability_chart(task_forecast, top_n=20):
+    """Create a bar chart of the tasks most likely to finish after their end date."""
+    at_risk = task_forecast.dropna(subset=['Slip Probability (%)'])
+    at_risk = at_risk[at_risk['Slip Probability (%)'] > 0].nlargest(top_n, 'Slip Probability (%)')
+    if at_risk.empty:
+        st.info("No tasks are forecast to slip past their end date.")
+        return go.Figure()
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=at_risk['Task No'].astype(str),
+        y=at_risk['Slip Probability (%)'],
+        text=at_risk['Slip Probability (%)'].round(0),
+        textposition='auto',
+        texttemplate='%{text:.0f}%',
+        marker_color='red',
+        name='Slip Probability',
+        customdata=np.stack([
+            at_risk['Task'].astype(str),
+            at_risk['End date'].dt.strftime('%Y-%m-%d'),
+            at_risk['Forecast P50'].dt.strftime('%Y-%m-%d'),
+            at_risk['Forecast P90'].dt.strftime('%Y-%m-%d')
+        ], axis=-1),
+        hovertemplate='Task: %{customdata[0]}<br>End: %{customdata[1]}<br>'
+                      'P50: %{customdata[2]}<br>P90: %{customdata[3]}<br>Slip: %{y:.0f}%'
+    ))
+    fig.update_layout(
+        title=f"Top {len(at_risk)} Tasks by Slip Probability",
+        xaxis_title="Task Number",
+        yaxis_title="Slip Probability (%)",
+        yaxis_range=[0, 100],
+        xaxis=dict(type='category'),
+        bargap=0.2,
+        showlegend=False
+    )
+    return fig